@@ -286,6 +286,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
             if ATTR_ALL in service.data:
                 group.mode = all if service.data[ATTR_ALL] else any
+                group.async_update_group_state()
                 need_update = True
 
             if need_update:
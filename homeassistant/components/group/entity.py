@@ -4,13 +4,15 @@ from __future__ import annotations
 
 from abc import abstractmethod
 import asyncio
-from collections.abc import Callable, Collection, Mapping
+from collections.abc import Callable, Collection, Iterable, KeysView, Mapping
 import logging
+import threading
 from typing import Any
 
 from homeassistant.const import ATTR_ASSUMED_STATE, ATTR_ENTITY_ID, STATE_OFF, STATE_ON
 from homeassistant.core import (
     CALLBACK_TYPE,
+    Context,
     Event,
     EventStateChangedData,
     HomeAssistant,
@@ -22,6 +24,7 @@ from homeassistant.helpers import start
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.frame import report
 
 from .const import ATTR_AUTO, ATTR_ORDER, DOMAIN, GROUP_ORDER, REG_KEY
 from .registry import GroupIntegrationRegistry
@@ -32,6 +35,23 @@ _PACKAGE_LOGGER = logging.getLogger(__package__)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Flags kept per group member
+_MEMBER_SEEN = 1
+_MEMBER_ON = 2
+_MEMBER_ASSUMED = 4
+
+# Classifies a member state, returns if it is on and the on states it implies
+_MemberClassifier = Callable[[str], tuple[bool, Collection[str]]]
+
+
+def _release_count(counts: dict[str, int], key: str) -> bool:
+    """Decrement the count of a key, return if no count is left."""
+    if (count := counts[key] - 1) == 0:
+        del counts[key]
+        return True
+    counts[key] = count
+    return False
+
 
 class GroupEntity(Entity):
     """Representation of a Group of entities."""
@@ -40,6 +60,17 @@ class GroupEntity(Entity):
 
     _attr_should_poll = False
     _entity_ids: list[str]
+    _pending_update_task: asyncio.Task[None] | None = None
+    # Set automatically for subclasses implementing async_update_supported_features
+    _tracks_supported_features = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Initialize a GroupEntity subclass."""
+        super().__init_subclass__(**kwargs)
+        cls._tracks_supported_features = (
+            cls.async_update_supported_features
+            is not GroupEntity.async_update_supported_features
+        )
 
     @callback
     def async_start_preview(
@@ -48,35 +79,62 @@ class GroupEntity(Entity):
     ) -> CALLBACK_TYPE:
         """Render a preview."""
 
-        for entity_id in self._entity_ids:
-            if (state := self.hass.states.get(entity_id)) is None:
-                continue
-            self.async_update_supported_features(entity_id, state)
+        if self._tracks_supported_features:
+            get_state = self.hass.states.get
+            update_supported_features = self.async_update_supported_features
+            for entity_id in self._entity_ids:
+                if (state := get_state(entity_id)) is None:
+                    continue
+                update_supported_features(entity_id, state)
+
+        pending_update: asyncio.Handle | None = None
+
+        @callback
+        def async_update_preview() -> None:
+            """Render the preview for all pending child updates."""
+            nonlocal pending_update
+            pending_update = None
+            self.async_update_group_state()
+            calculated_state = self._async_calculate_state()
+            preview_callback(calculated_state.state, calculated_state.attributes)
 
         @callback
         def async_state_changed_listener(
-            event: Event[EventStateChangedData] | None,
+            event: Event[EventStateChangedData],
         ) -> None:
             """Handle child updates."""
-            self.async_update_group_state()
-            if event:
+            nonlocal pending_update
+            if self._tracks_supported_features:
                 self.async_update_supported_features(
                     event.data["entity_id"], event.data["new_state"]
                 )
-            calculated_state = self._async_calculate_state()
-            preview_callback(calculated_state.state, calculated_state.attributes)
+            # Coalesce bursts of child updates into a single preview render
+            if pending_update is None:
+                pending_update = self.hass.loop.call_soon(async_update_preview)
 
-        async_state_changed_listener(None)
-        return async_track_state_change_event(
+        async_update_preview()
+        unsub_state_changed = async_track_state_change_event(
             self.hass, self._entity_ids, async_state_changed_listener
         )
 
+        @callback
+        def async_stop_preview() -> None:
+            """Stop the preview."""
+            unsub_state_changed()
+            if pending_update is not None:
+                pending_update.cancel()
+
+        return async_stop_preview
+
     async def async_added_to_hass(self) -> None:
         """Register listeners."""
-        for entity_id in self._entity_ids:
-            if (state := self.hass.states.get(entity_id)) is None:
-                continue
-            self.async_update_supported_features(entity_id, state)
+        if self._tracks_supported_features:
+            get_state = self.hass.states.get
+            update_supported_features = self.async_update_supported_features
+            for entity_id in self._entity_ids:
+                if (state := get_state(entity_id)) is None:
+                    continue
+                update_supported_features(entity_id, state)
 
         @callback
         def async_state_changed_listener(
@@ -84,18 +142,38 @@ class GroupEntity(Entity):
         ) -> None:
             """Handle child updates."""
             self.async_set_context(event.context)
-            self.async_update_supported_features(
-                event.data["entity_id"], event.data["new_state"]
-            )
-            self.async_defer_or_update_ha_state()
+            if self._tracks_supported_features:
+                self.async_update_supported_features(
+                    event.data["entity_id"], event.data["new_state"]
+                )
+            # Coalesce bursts of member changes into a single update
+            if self._pending_update_task is None:
+                self._pending_update_task = self.hass.async_create_task(
+                    self._async_flush_pending_update(),
+                    f"Group update {self.entity_id}",
+                    eager_start=False,
+                )
 
         self.async_on_remove(
             async_track_state_change_event(
                 self.hass, self._entity_ids, async_state_changed_listener
             )
         )
+        self.async_on_remove(self._async_cancel_pending_update)
         self.async_on_remove(start.async_at_start(self.hass, self._update_at_start))
 
+    async def _async_flush_pending_update(self) -> None:
+        """Update the group state once for all pending member changes."""
+        self._pending_update_task = None
+        self.async_defer_or_update_ha_state()
+
+    @callback
+    def _async_cancel_pending_update(self) -> None:
+        """Cancel a pending group state update."""
+        if self._pending_update_task is not None:
+            self._pending_update_task.cancel()
+            self._pending_update_task = None
+
     @callback
     def _update_at_start(self, _: HomeAssistant) -> None:
         """Update the group state at start."""
@@ -136,6 +214,17 @@ class Group(Entity):
     single_active_domain: str | None
     tracking: tuple[str, ...]
     trackable: tuple[str, ...]
+    _extra_state_attributes: dict[str, Any] | None
+    # The member state classifier of each trackable domain
+    _classifiers: dict[str, _MemberClassifier]
+    _registered_domain_count: int
+    _member_index: dict[str, int]
+    _single_domain_off_state: str | None
+    # Only available once there are entities to track
+    _registry: GroupIntegrationRegistry
+    _on_states_by_domain: dict[str, set[str]]
+    _on_off_keys: KeysView[str]
+    _off_on_mapping: dict[str, str]
 
     def __init__(
         self,
@@ -157,16 +246,26 @@ class Group(Entity):
         self._state: str | None = None
         self._attr_icon = icon
         self._set_tracked(entity_ids)
-        self._on_off: dict[str, bool] = {}
-        self._assumed: dict[str, bool] = {}
-        self._on_states: set[str] = set()
+        num_members = len(self.trackable)
+        # Flags, current state and implied on states of each member,
+        # indexed by the position of the member in trackable
+        self._member_flags = bytearray(num_members)
+        self._member_states: list[str | None] = [None] * num_members
+        self._member_on_states: list[Collection[str] | None] = [None] * num_members
+        # Number of members that have been seen, are on or have an assumed state
+        self._seen_count = 0
+        self._on_count = 0
+        self._assumed_count = 0
+        # Number of members in each state and implying each on state
+        self._state_counts: dict[str, int] = {}
+        self._on_state_counts: dict[str, int] = {}
         self.created_by_service = created_by_service
-        self.mode = any
-        if mode:
-            self.mode = all
+        self._mode_all = bool(mode)
         self._order = order
         self._assumed_state = False
         self._async_unsub_state_changed: CALLBACK_TYPE | None = None
+        self._pending_update_task: asyncio.Task[None] | None = None
+        self._pending_context: Context | None = None
 
     @staticmethod
     @callback
@@ -253,9 +352,11 @@ class Group(Entity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes for the group."""
-        data = {ATTR_ENTITY_ID: self.tracking, ATTR_ORDER: self._order}
-        if self.created_by_service:
-            data[ATTR_AUTO] = True
+        if (data := self._extra_state_attributes) is None:
+            data = {ATTR_ENTITY_ID: self.tracking, ATTR_ORDER: self._order}
+            if self.created_by_service:
+                data[ATTR_AUTO] = True
+            self._extra_state_attributes = data
 
         return data
 
@@ -264,8 +365,35 @@ class Group(Entity):
         """Test if any member has an assumed state."""
         return self._assumed_state
 
+    @property
+    def mode(self) -> Callable[[Iterable[object]], bool]:
+        """Return how the member states are aggregated, any or all."""
+        return all if self._mode_all else any
+
+    @mode.setter
+    def mode(self, value: Callable[[Iterable[object]], bool]) -> None:
+        """Set how the member states are aggregated, any or all."""
+        self._mode_all = value is all
+
     def update_tracked_entity_ids(self, entity_ids: Collection[str] | None) -> None:
-        """Update the member entity IDs."""
+        """Update the member entity IDs.
+
+        Deprecated, use async_update_tracked_entity_ids instead.
+        """
+        report(
+            "calls `update_tracked_entity_ids` which is deprecated and will be"
+            " removed in Home Assistant 2024.11, use"
+            " `async_update_tracked_entity_ids` instead",
+            error_if_core=False,
+        )
+        if (
+            loop_thread_ident := self.hass.loop.__dict__.get("_thread_ident")
+        ) and loop_thread_ident == threading.get_ident():
+            # Waiting for the result from within the event loop would deadlock
+            raise RuntimeError(
+                "Cannot call update_tracked_entity_ids from within the event loop,"
+                " use async_update_tracked_entity_ids instead"
+            )
         asyncio.run_coroutine_threadsafe(
             self.async_update_tracked_entity_ids(entity_ids), self.hass.loop
         ).result()
@@ -277,29 +405,45 @@ class Group(Entity):
 
         This method must be run in the event loop.
         """
+        if self._async_unsub_state_changed is None:
+            # Not tracking yet, so there is no tracked state to keep
+            self._set_tracked(entity_ids)
+            self._async_start()
+            return
+
         self._async_stop()
+        prev_member_index = self._member_index
         self._set_tracked(entity_ids)
-        self._reset_tracked_state()
-        self._async_start()
+        self._update_tracked_state(prev_member_index)
+        self._async_start_tracking()
+        self.async_write_ha_state()
 
     def _set_tracked(self, entity_ids: Collection[str] | None) -> None:
         """Tuple of entities to be tracked."""
         # tracking are the entities we want to track
         # trackable are the entities we actually watch
 
+        self._extra_state_attributes = None
+        classifiers: dict[str, _MemberClassifier] = {}
+        self._classifiers = classifiers
         if not entity_ids:
+            self._member_index = {}
             self.tracking = ()
             self.trackable = ()
             self.single_active_domain = None
+            self._single_domain_off_state = None
             return
 
-        registry: GroupIntegrationRegistry = self.hass.data[REG_KEY]
+        registry = self._registry = self.hass.data[REG_KEY]
+        # The registry mappings are only ever mutated in place
+        self._on_states_by_domain = registry.on_states_by_domain
+        self._on_off_keys = registry.on_off_mapping.keys()
+        self._off_on_mapping = registry.off_on_mapping
+        self._registered_domain_count = len(registry.on_states_by_domain)
         excluded_domains = registry.exclude_domains
 
         tracking: list[str] = []
         trackable: list[str] = []
-        self.single_active_domain = None
-        multiple_domains: bool = False
         for ent_id in entity_ids:
             ent_id_lower = ent_id.lower()
             domain = split_entity_id(ent_id_lower)[0]
@@ -308,15 +452,41 @@ class Group(Entity):
                 continue
 
             trackable.append(ent_id_lower)
+            if domain not in classifiers:
+                classifiers[domain] = self._build_classifier(domain)
 
-            if not multiple_domains and self.single_active_domain is None:
-                self.single_active_domain = domain
-            if self.single_active_domain != domain:
-                multiple_domains = True
-                self.single_active_domain = None
-
+        self.single_active_domain = (
+            next(iter(classifiers)) if len(classifiers) == 1 else None
+        )
+        self._single_domain_off_state = (
+            registry.off_state_by_domain.get(self.single_active_domain)
+            if self.single_active_domain
+            else None
+        )
         self.trackable = tuple(trackable)
         self.tracking = tuple(tracking)
+        self._member_index = {
+            entity_id: index for index, entity_id in enumerate(self.trackable)
+        }
+
+    def _build_classifier(self, domain: str) -> _MemberClassifier:
+        """Return the classifier for the members of a domain."""
+        if (entity_on_state := self._on_states_by_domain.get(domain)) is None:
+            return self._classify_unregistered
+
+        def _classify(state: str) -> tuple[bool, Collection[str]]:
+            return state in entity_on_state, entity_on_state
+
+        return _classify
+
+    def _classify_unregistered(self, state: str) -> tuple[bool, Collection[str]]:
+        """Classify the state of a member without registered on states."""
+        # Handle the group of a group case
+        if state in self._on_off_keys:
+            return True, (state,)
+        if (on_state := self._off_on_mapping.get(state)) is not None:
+            return False, (on_state,)
+        return False, ()
 
     @callback
     def _async_start(self, _: HomeAssistant | None = None) -> None:
@@ -347,6 +517,10 @@ class Group(Entity):
         if self._async_unsub_state_changed:
             self._async_unsub_state_changed()
             self._async_unsub_state_changed = None
+        if self._pending_update_task is not None:
+            self._pending_update_task.cancel()
+            self._pending_update_task = None
+        self._pending_context = None
 
     @callback
     def async_update_group_state(self) -> None:
@@ -362,7 +536,8 @@ class Group(Entity):
         """Handle removal from Home Assistant."""
         self._async_stop()
 
-    async def _async_state_changed_listener(
+    @callback
+    def _async_state_changed_listener(
         self, event: Event[EventStateChangedData]
     ) -> None:
         """Respond to a member state changing.
@@ -373,118 +548,215 @@ class Group(Entity):
         if self._async_unsub_state_changed is None:
             return
 
-        self.async_set_context(event.context)
-
         if (new_state := event.data["new_state"]) is None:
             # The state was removed from the state machine
             self._reset_tracked_state()
+        elif not self._see_state(new_state):
+            # The change does not affect the group aggregation
+            return
 
-        self._async_update_group_state(new_state)
-        self.async_write_ha_state()
+        # Applied when the group state is written
+        self._pending_context = event.context
+
+        # Coalesce bursts of member changes into a single update
+        if self._pending_update_task is None:
+            self._pending_update_task = self.hass.async_create_task(
+                self._async_flush_group_update(),
+                f"Group update {self.entity_id}",
+                eager_start=False,
+            )
+
+    async def _async_flush_group_update(self) -> None:
+        """Update and write the group state once for all pending member changes.
+
+        This method must be run in the event loop.
+        """
+        self._pending_update_task = None
+        context = self._pending_context
+        self._pending_context = None
+        prev_state = (self._state, self._assumed_state)
+        self._async_update_group_state()
+        # The attributes only change when the tracked entities change,
+        # which writes the state itself, so only write if the state changed
+        if (self._state, self._assumed_state) != prev_state:
+            if context is not None:
+                self.async_set_context(context)
+            self.async_write_ha_state()
 
     def _reset_tracked_state(self) -> None:
         """Reset tracked state."""
-        self._on_off = {}
-        self._assumed = {}
-        self._on_states = set()
-
+        num_members = len(self.trackable)
+        self._member_flags = bytearray(num_members)
+        self._member_states = [None] * num_members
+        self._member_on_states = [None] * num_members
+        self._seen_count = 0
+        self._on_count = 0
+        self._assumed_count = 0
+        self._state_counts = {}
+        self._on_state_counts = {}
+
+        get_state = self.hass.states.get
+        see_state = self._see_state
         for entity_id in self.trackable:
-            if (state := self.hass.states.get(entity_id)) is not None:
+            if (state := get_state(entity_id)) is not None:
+                see_state(state)
+
+    def _update_tracked_state(self, prev_member_index: dict[str, int]) -> None:
+        """Update tracked state for the members added and removed.
+
+        Members tracked before and after keep their tracked state.
+        """
+        prev_member_flags = self._member_flags
+        prev_member_states = self._member_states
+        prev_member_on_states = self._member_on_states
+        member_index = self._member_index
+        num_members = len(self.trackable)
+        member_flags = bytearray(num_members)
+        member_states: list[str | None] = [None] * num_members
+        member_on_states: list[Collection[str] | None] = [None] * num_members
+        self._member_flags = member_flags
+        self._member_states = member_states
+        self._member_on_states = member_on_states
+        for entity_id, prev_index in prev_member_index.items():
+            if (index := member_index.get(entity_id)) is not None:
+                member_flags[index] = prev_member_flags[prev_index]
+                member_states[index] = prev_member_states[prev_index]
+                member_on_states[index] = prev_member_on_states[prev_index]
+                continue
+
+            # The member was removed
+            flags = prev_member_flags[prev_index]
+            self._seen_count -= bool(flags & _MEMBER_SEEN)
+            self._on_count -= bool(flags & _MEMBER_ON)
+            self._assumed_count -= bool(flags & _MEMBER_ASSUMED)
+            if (member_state := prev_member_states[prev_index]) is not None:
+                _release_count(self._state_counts, member_state)
+            for on_state in prev_member_on_states[prev_index] or ():
+                _release_count(self._on_state_counts, on_state)
+
+        get_state = self.hass.states.get
+        for entity_id in member_index.keys() - prev_member_index.keys():
+            if (state := get_state(entity_id)) is not None:
                 self._see_state(state)
 
-    def _see_state(self, new_state: State) -> None:
-        """Keep track of the state."""
-        entity_id = new_state.entity_id
-        domain = new_state.domain
+    def _see_state(self, new_state: State) -> bool:
+        """Keep track of the state.
+
+        Return if the change can affect the group state.
+        """
+        index = self._member_index[new_state.entity_id]
         state = new_state.state
-        registry: GroupIntegrationRegistry = self.hass.data[REG_KEY]
-        self._assumed[entity_id] = bool(new_state.attributes.get(ATTR_ASSUMED_STATE))
-
-        if domain not in registry.on_states_by_domain:
-            # Handle the group of a group case
-            if state in registry.on_off_mapping:
-                self._on_states.add(state)
-            elif state in registry.off_on_mapping:
-                self._on_states.add(registry.off_on_mapping[state])
-            self._on_off[entity_id] = state in registry.on_off_mapping
-        else:
-            entity_on_state = registry.on_states_by_domain[domain]
-            self._on_states.update(entity_on_state)
-            self._on_off[entity_id] = state in entity_on_state
+        changed = False
+
+        state_counts = self._state_counts
+        member_states = self._member_states
+        if (prev_state := member_states[index]) != state:
+            if prev_state is not None and _release_count(state_counts, prev_state):
+                changed = True
+            if state in state_counts:
+                state_counts[state] += 1
+            else:
+                state_counts[state] = 1
+                changed = True
+            member_states[index] = state
+
+        classifiers = self._classifiers
+        # Domains only register their on states once, but may do so
+        # after tracking started
+        if len(self._on_states_by_domain) != self._registered_domain_count:
+            self._registered_domain_count = len(self._on_states_by_domain)
+            for domain in classifiers:
+                classifiers[domain] = self._build_classifier(domain)
+        is_on, on_states = classifiers[new_state.domain](state)
+        # Members of a registered domain always imply the same on states,
+        # other members usually imply an equal tuple of on states
+        member_on_states = self._member_on_states
+        if (
+            prev_on_states := member_on_states[index]
+        ) is not on_states and prev_on_states != on_states:
+            on_state_counts = self._on_state_counts
+            if prev_on_states is not None:
+                for on_state in prev_on_states:
+                    if _release_count(on_state_counts, on_state):
+                        changed = True
+            for on_state in on_states:
+                if on_state in on_state_counts:
+                    on_state_counts[on_state] += 1
+                else:
+                    on_state_counts[on_state] = 1
+                    changed = True
+            member_on_states[index] = on_states
+
+        is_assumed = bool(new_state.attributes.get(ATTR_ASSUMED_STATE))
+        flags = _MEMBER_SEEN
+        if is_on:
+            flags |= _MEMBER_ON
+        if is_assumed:
+            flags |= _MEMBER_ASSUMED
+        member_flags = self._member_flags
+        if (prev_flags := member_flags[index]) != flags:
+            member_flags[index] = flags
+            self._seen_count += not prev_flags & _MEMBER_SEEN
+            self._on_count += is_on - bool(prev_flags & _MEMBER_ON)
+            self._assumed_count += is_assumed - bool(prev_flags & _MEMBER_ASSUMED)
+            changed = True
+        return changed
 
     def _detect_specific_on_off_state(self, group_is_on: bool) -> set[str]:
         """Check if a specific ON or OFF state is possible."""
         # In case the group contains entities of the same domain with the same ON
         # or an OFF state (one or more domains), we want to use that specific state.
         # If we have more then one ON or OFF state we default to STATE_ON or STATE_OFF.
-        registry: GroupIntegrationRegistry = self.hass.data[REG_KEY]
-        active_on_states: set[str] = set()
-        active_off_states: set[str] = set()
-        for entity_id in self.trackable:
-            if (state := self.hass.states.get(entity_id)) is None:
-                continue
-            current_state = state.state
-            if (
-                group_is_on
-                and (domain_on_states := registry.on_states_by_domain.get(state.domain))
-                and current_state in domain_on_states
-            ):
-                active_on_states.add(current_state)
-                # If we have more than one on state, the group state
-                # will result in STATE_ON and we can stop checking
-                if len(active_on_states) > 1:
-                    break
-            elif current_state in registry.off_on_mapping:
-                active_off_states.add(current_state)
-
-        return active_on_states if group_is_on else active_off_states
+        # The ON state is only specific when all members share a single domain.
+        member_states = self._state_counts.keys()
+        if not group_is_on:
+            return member_states & self._off_on_mapping.keys()
+
+        if self.single_active_domain is None or not (
+            domain_on_states := self._registry.on_states_by_domain.get(
+                self.single_active_domain
+            )
+        ):
+            return set()
+        return member_states & domain_on_states
 
     @callback
-    def _async_update_group_state(self, tr_state: State | None = None) -> None:
+    def _async_update_group_state(self) -> None:
         """Update group state.
 
-        Optionally you can provide the only state changed since last update
-        allowing this method to take shortcuts.
-
         This method must be run in the event loop.
         """
-        # To store current states of group entities. Might not be needed.
-        if tr_state:
-            self._see_state(tr_state)
-
-        if not self._on_off:
+        if not (num_tracked := self._seen_count):
             return
 
-        if (
-            tr_state is None
-            or self._assumed_state
-            and not tr_state.attributes.get(ATTR_ASSUMED_STATE)
-        ):
-            self._assumed_state = self.mode(self._assumed.values())
-
-        elif tr_state.attributes.get(ATTR_ASSUMED_STATE):
-            self._assumed_state = True
+        if self._mode_all:
+            self._assumed_state = self._assumed_count == num_tracked
+        else:
+            self._assumed_state = self._assumed_count > 0
 
         # If we do not have an on state for any domains
         # we use None (which will be STATE_UNKNOWN)
-        if (num_on_states := len(self._on_states)) == 0:
+        if (num_on_states := len(self._on_state_counts)) == 0:
             self._state = None
             return
 
-        group_is_on = self.mode(self._on_off.values())
+        if self._mode_all:
+            group_is_on = self._on_count == num_tracked
+        else:
+            group_is_on = self._on_count > 0
 
         # If all the entity domains we are tracking
         # have the same on state we use this state
         # and its hass.data[REG_KEY].on_off_mapping to off
         if num_on_states == 1:
-            on_state = next(iter(self._on_states))
+            on_state = next(iter(self._on_state_counts))
         # If the entity domains have more than one
         # on state, we use STATE_ON/STATE_OFF, unless there is
         # only one specific `on` state in use for one specific domain
         elif self.single_active_domain and num_on_states:
             active_on_states = self._detect_specific_on_off_state(True)
             on_state = (
-                list(active_on_states)[0] if len(active_on_states) == 1 else STATE_ON
+                next(iter(active_on_states)) if len(active_on_states) == 1 else STATE_ON
             )
         elif group_is_on:
             on_state = STATE_ON
@@ -492,20 +764,26 @@ class Group(Entity):
             self._state = on_state
             return
 
-        registry: GroupIntegrationRegistry = self.hass.data[REG_KEY]
-        if (
+        if (off_state := self._single_domain_off_state) is None and (
             active_domain := self.single_active_domain
-        ) and active_domain in registry.off_state_by_domain:
+        ):
+            # The domain may have registered its off state after tracking started
+            off_state = self._single_domain_off_state = (
+                self._registry.off_state_by_domain.get(active_domain)
+            )
+        if off_state is not None:
             # If there is only one domain used,
             # then we return the off state for that domain.s
-            self._state = registry.off_state_by_domain[active_domain]
+            self._state = off_state
         else:
             active_off_states = self._detect_specific_on_off_state(False)
             # If there is one off state in use then we return that specific state,
             # also if there a multiple domains involved, e.g.
             # person and device_tracker, with a shared state.
             self._state = (
-                list(active_off_states)[0] if len(active_off_states) == 1 else STATE_OFF
+                next(iter(active_off_states))
+                if len(active_off_states) == 1
+                else STATE_OFF
             )
 
 
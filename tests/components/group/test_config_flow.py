@@ -1,5 +1,6 @@
 """Test the Switch config flow."""
 
+from collections.abc import Mapping
 from typing import Any
 from unittest.mock import patch
 
@@ -7,8 +8,9 @@ import pytest
 
 from homeassistant import config_entries
 from homeassistant.components.group import DOMAIN, async_setup_entry
+from homeassistant.components.group.switch import async_create_preview_switch
 from homeassistant.const import STATE_UNKNOWN
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.helpers import entity_registry as er
 
@@ -725,3 +727,77 @@ async def test_option_flow_sensor_preview_config_entry_removed(
     msg = await client.receive_json()
     assert not msg["success"]
     assert msg["error"] == {"code": "home_assistant_error", "message": "Unknown error"}
+
+
+async def test_config_flow_preview_coalesces_child_updates(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test a burst of child updates renders the preview once."""
+    client = await hass_ws_client(hass)
+
+    input_entities = ["switch.input_one", "switch.input_two"]
+    hass.states.async_set(input_entities[0], "off")
+    hass.states.async_set(input_entities[1], "off")
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"next_step_id": "switch"},
+    )
+    await hass.async_block_till_done()
+    assert result["preview"] == "group"
+
+    await client.send_json_auto_id(
+        {
+            "type": "group/start_preview",
+            "flow_id": result["flow_id"],
+            "flow_type": "config_flow",
+            "user_input": {"name": "My group", "entities": input_entities},
+        }
+    )
+    msg = await client.receive_json()
+    assert msg["success"]
+
+    msg = await client.receive_json()
+    assert msg["event"]["state"] == "off"
+
+    hass.states.async_set(input_entities[0], "on")
+    hass.states.async_set(input_entities[1], "on")
+    hass.states.async_set(input_entities[0], "off")
+
+    msg = await client.receive_json()
+    assert msg["event"]["state"] == "on"
+
+    # Any other preview message would have been sent before the pong
+    await client.send_json_auto_id({"type": "ping"})
+    msg = await client.receive_json()
+    assert msg["type"] == "pong"
+
+
+async def test_stop_preview_cancels_pending_render(hass: HomeAssistant) -> None:
+    """Test stopping the preview cancels a queued preview render."""
+    input_entities = ["switch.input_one", "switch.input_two"]
+    hass.states.async_set(input_entities[0], "off")
+    hass.states.async_set(input_entities[1], "off")
+
+    preview_entity = async_create_preview_switch(
+        hass, "My group", {"entities": input_entities}
+    )
+    preview_entity.hass = hass
+
+    preview_states: list[str] = []
+
+    @callback
+    def async_preview_updated(state: str, attributes: Mapping[str, Any]) -> None:
+        preview_states.append(state)
+
+    async_stop_preview = preview_entity.async_start_preview(async_preview_updated)
+    assert preview_states == ["off"]
+
+    hass.states.async_set(input_entities[0], "on")
+    async_stop_preview()
+    await hass.async_block_till_done()
+
+    assert preview_states == ["off"]
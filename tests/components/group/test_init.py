@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 from collections import OrderedDict
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -15,6 +15,7 @@ from homeassistant.const import (
     ATTR_FRIENDLY_NAME,
     ATTR_ICON,
     EVENT_HOMEASSISTANT_START,
+    EVENT_STATE_CHANGED,
     SERVICE_RELOAD,
     STATE_CLOSED,
     STATE_HOME,
@@ -23,17 +24,23 @@ from homeassistant.const import (
     STATE_OFF,
     STATE_ON,
     STATE_OPEN,
+    STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     STATE_UNLOCKED,
 )
-from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.core import Context, CoreState, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 from homeassistant.setup import async_setup_component
 
 from . import common
 
-from tests.common import MockConfigEntry, assert_setup_component
+from tests.common import (
+    MockConfigEntry,
+    assert_setup_component,
+    async_capture_events,
+    mock_platform,
+)
 
 
 async def test_setup_group_with_mixed_groupable_states(hass: HomeAssistant) -> None:
@@ -167,6 +174,150 @@ async def test_group_turns_off_if_all_off(hass: HomeAssistant) -> None:
     assert group_state.state == STATE_OFF
 
 
+async def test_burst_of_member_changes_is_coalesced(hass: HomeAssistant) -> None:
+    """Test a burst of member changes results in a single group update."""
+    hass.states.async_set("light.Bowl", STATE_OFF)
+    hass.states.async_set("light.Ceiling", STATE_OFF)
+    hass.states.async_set("light.Desk", STATE_OFF)
+
+    assert await async_setup_component(hass, "group", {})
+
+    test_group = await group.Group.async_create_group(
+        hass,
+        "init_group",
+        created_by_service=True,
+        entity_ids=["light.Bowl", "light.Ceiling", "light.Desk"],
+        icon=None,
+        mode=None,
+        object_id=None,
+        order=None,
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(test_group.entity_id).state == STATE_OFF
+
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set("light.Bowl", STATE_ON)
+    hass.states.async_set("light.Ceiling", STATE_ON)
+    hass.states.async_set("light.Desk", STATE_ON)
+    await hass.async_block_till_done()
+
+    group_events = [
+        event for event in events if event.data["entity_id"] == test_group.entity_id
+    ]
+    assert len(group_events) == 1
+    assert hass.states.get(test_group.entity_id).state == STATE_ON
+
+
+async def test_group_state_is_only_written_when_changed(
+    hass: HomeAssistant,
+) -> None:
+    """Test the group state is only written when it changes."""
+    hass.states.async_set("light.Bowl", STATE_ON)
+    hass.states.async_set("light.Ceiling", STATE_ON)
+    hass.states.async_set("light.Desk", STATE_OFF)
+
+    assert await async_setup_component(hass, "group", {})
+
+    test_group = await group.Group.async_create_group(
+        hass,
+        "init_group",
+        created_by_service=True,
+        entity_ids=["light.Bowl", "light.Ceiling", "light.Desk"],
+        icon=None,
+        mode=None,
+        object_id=None,
+        order=None,
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(test_group.entity_id).state == STATE_ON
+
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    with patch.object(
+        test_group, "async_write_ha_state", wraps=test_group.async_write_ha_state
+    ) as mock_write_ha_state:
+        hass.states.async_set("light.Ceiling", STATE_OFF)
+        await hass.async_block_till_done()
+
+    mock_write_ha_state.assert_not_called()
+    group_events = [
+        event for event in events if event.data["entity_id"] == test_group.entity_id
+    ]
+    assert group_events == []
+    assert hass.states.get(test_group.entity_id).state == STATE_ON
+
+    bowl_context = Context()
+    desk_context = Context()
+    hass.states.async_set("light.Bowl", STATE_OFF, context=bowl_context)
+    hass.states.async_set("light.Desk", STATE_UNAVAILABLE, context=desk_context)
+    hass.states.async_set(
+        "light.Ceiling", STATE_OFF, {"brightness": 0}, context=Context()
+    )
+    await hass.async_block_till_done()
+
+    group_events = [
+        event for event in events if event.data["entity_id"] == test_group.entity_id
+    ]
+    assert len(group_events) == 1
+    group_state = hass.states.get(test_group.entity_id)
+    assert group_state.state == STATE_OFF
+    assert group_state.context is desk_context
+
+    events.clear()
+    with patch.object(
+        test_group, "async_write_ha_state", wraps=test_group.async_write_ha_state
+    ) as mock_write_ha_state:
+        hass.states.async_set("light.Desk", STATE_OFF)
+        await hass.async_block_till_done()
+
+    mock_write_ha_state.assert_not_called()
+    group_events = [
+        event for event in events if event.data["entity_id"] == test_group.entity_id
+    ]
+    assert group_events == []
+    assert hass.states.get(test_group.entity_id).state == STATE_OFF
+
+
+async def test_group_ignores_irrelevant_member_changes(
+    hass: HomeAssistant,
+) -> None:
+    """Test member changes which cannot affect the group do not update it."""
+    hass.states.async_set("light.Bowl", STATE_ON)
+    hass.states.async_set("light.Ceiling", STATE_OFF)
+
+    assert await async_setup_component(hass, "group", {})
+
+    test_group = await group.Group.async_create_group(
+        hass,
+        "init_group",
+        created_by_service=True,
+        entity_ids=["light.Bowl", "light.Ceiling"],
+        icon=None,
+        mode=None,
+        object_id=None,
+        order=None,
+    )
+    await hass.async_block_till_done()
+
+    with patch.object(
+        test_group,
+        "_async_update_group_state",
+        wraps=test_group._async_update_group_state,
+    ) as mock_update_group_state:
+        hass.states.async_set("light.Bowl", STATE_ON, {"brightness": 100})
+        await hass.async_block_till_done()
+        mock_update_group_state.assert_not_called()
+
+        hass.states.async_set(
+            "light.Ceiling", STATE_OFF, {"brightness": 0, ATTR_ASSUMED_STATE: True}
+        )
+        await hass.async_block_till_done()
+        mock_update_group_state.assert_called_once()
+
+    group_state = hass.states.get(test_group.entity_id)
+    assert group_state.state == STATE_ON
+    assert group_state.attributes[ATTR_ASSUMED_STATE] is True
+
+
 async def test_group_turns_on_if_all_are_off_and_one_turns_on(
     hass: HomeAssistant,
 ) -> None:
@@ -549,6 +700,41 @@ async def test_set_assumed_state_based_on_tracked(hass: HomeAssistant) -> None:
     assert not state.attributes.get(ATTR_ASSUMED_STATE)
 
 
+async def test_set_assumed_state_based_on_all_tracked(hass: HomeAssistant) -> None:
+    """Test assumed state of a group which requires all members to be on."""
+    hass.states.async_set("light.Bowl", STATE_ON)
+    hass.states.async_set("light.Ceiling", STATE_OFF)
+
+    assert await async_setup_component(hass, "group", {})
+
+    test_group = await group.Group.async_create_group(
+        hass,
+        "init_group",
+        created_by_service=False,
+        entity_ids=["light.Bowl", "light.Ceiling"],
+        icon=None,
+        mode=True,
+        object_id=None,
+        order=None,
+    )
+
+    state = hass.states.get(test_group.entity_id)
+    assert not state.attributes.get(ATTR_ASSUMED_STATE)
+
+    # Only assumed once all members have an assumed state
+    hass.states.async_set("light.Bowl", STATE_ON, {ATTR_ASSUMED_STATE: True})
+    await hass.async_block_till_done()
+
+    state = hass.states.get(test_group.entity_id)
+    assert not state.attributes.get(ATTR_ASSUMED_STATE)
+
+    hass.states.async_set("light.Ceiling", STATE_OFF, {ATTR_ASSUMED_STATE: True})
+    await hass.async_block_till_done()
+
+    state = hass.states.get(test_group.entity_id)
+    assert state.attributes.get(ATTR_ASSUMED_STATE)
+
+
 async def test_group_updated_after_device_tracker_zone_change(
     hass: HomeAssistant,
 ) -> None:
@@ -813,6 +999,83 @@ async def test_modify_group(hass: HomeAssistant) -> None:
     assert group_state.attributes.get(ATTR_FRIENDLY_NAME) == "friendly_name"
 
 
+async def test_update_tracked_entity_ids(hass: HomeAssistant) -> None:
+    """Test adding and removing members keeps the group state up to date."""
+    hass.states.async_set("light.Bowl", STATE_ON)
+    hass.states.async_set("light.Ceiling", STATE_OFF)
+    hass.states.async_set("cover.Shade", STATE_CLOSED)
+
+    assert await async_setup_component(hass, "group", {})
+
+    test_group = await group.Group.async_create_group(
+        hass,
+        "init_group",
+        created_by_service=False,
+        entity_ids=["light.Bowl", "light.Ceiling"],
+        icon=None,
+        mode=None,
+        object_id=None,
+        order=None,
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(test_group.entity_id).state == STATE_ON
+
+    await test_group.async_update_tracked_entity_ids(["light.Ceiling"])
+    await hass.async_block_till_done()
+    assert hass.states.get(test_group.entity_id).state == STATE_OFF
+
+    await test_group.async_update_tracked_entity_ids(["cover.Shade", "light.Ceiling"])
+    await hass.async_block_till_done()
+    group_state = hass.states.get(test_group.entity_id)
+    assert group_state.state == STATE_OFF
+    assert group_state.attributes["entity_id"] == ("cover.shade", "light.ceiling")
+
+    hass.states.async_set("light.Ceiling", STATE_ON)
+    await hass.async_block_till_done()
+    assert hass.states.get(test_group.entity_id).state == STATE_ON
+
+    await test_group.async_update_tracked_entity_ids(["light.Bowl"])
+    hass.states.async_set("light.Ceiling", STATE_OFF)
+    await hass.async_block_till_done()
+    assert hass.states.get(test_group.entity_id).state == STATE_ON
+
+
+async def test_update_tracked_entity_ids_deprecated(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the deprecated sync update of the tracked entity ids."""
+    hass.states.async_set("light.Bowl", STATE_ON)
+    hass.states.async_set("light.Ceiling", STATE_OFF)
+
+    assert await async_setup_component(hass, "group", {})
+
+    test_group = await group.Group.async_create_group(
+        hass,
+        "init_group",
+        created_by_service=False,
+        entity_ids=["light.Ceiling"],
+        icon=None,
+        mode=None,
+        object_id=None,
+        order=None,
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(test_group.entity_id).state == STATE_OFF
+
+    with pytest.raises(RuntimeError, match="from within the event loop"):
+        test_group.update_tracked_entity_ids(["light.Bowl"])
+
+    await hass.async_add_executor_job(
+        test_group.update_tracked_entity_ids, ["light.Bowl", "light.Ceiling"]
+    )
+    await hass.async_block_till_done()
+
+    assert "calls `update_tracked_entity_ids` which is deprecated" in caplog.text
+    group_state = hass.states.get(test_group.entity_id)
+    assert group_state.state == STATE_ON
+    assert group_state.attributes["entity_id"] == ("light.bowl", "light.ceiling")
+
+
 async def test_setup(hass: HomeAssistant) -> None:
     """Test setup method."""
     hass.states.async_set("light.Bowl", STATE_ON)
@@ -932,6 +1195,32 @@ async def test_service_group_services_add_remove_entities(hass: HomeAssistant) -
     assert "person.one" not in list(group_state.attributes["entity_id"])
 
 
+async def test_service_group_set_all(hass: HomeAssistant) -> None:
+    """Test changing the mode of a group with the set service."""
+    hass.states.async_set("light.Bowl", STATE_ON)
+    hass.states.async_set("light.Ceiling", STATE_OFF)
+
+    assert await async_setup_component(
+        hass,
+        "group",
+        {"group": {"lights": {"entities": ["light.Bowl", "light.Ceiling"]}}},
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.lights").state == STATE_ON
+
+    await hass.services.async_call(
+        group.DOMAIN,
+        group.SERVICE_SET,
+        {"object_id": "lights", "all": True},
+        blocking=True,
+    )
+    hass.states.async_set("light.Ceiling", STATE_OFF, {"brightness": 0})
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.lights").state == STATE_OFF
+
+
 async def test_service_group_set_group_remove_group(hass: HomeAssistant) -> None:
     """Check if service are available."""
     with assert_setup_component(0, "group"):
@@ -1355,6 +1644,49 @@ async def test_group_vacuum_on(hass: HomeAssistant) -> None:
     assert hass.states.get("group.group_zero").state == "cleaning"
 
 
+async def test_group_off_state_registered_after_group_created(
+    hass: HomeAssistant,
+) -> None:
+    """Test the off state of a domain registered after the group is created."""
+
+    @callback
+    def async_describe_on_off_states(
+        hass: HomeAssistant, registry: group.GroupIntegrationRegistry
+    ) -> None:
+        registry.on_off_states({"heating", "cooling"}, "idle")
+
+    hass.states.async_set("test.one", "heating")
+    hass.states.async_set("test.two", "idle")
+    hass.set_state(CoreState.stopped)
+
+    assert await async_setup_component(
+        hass,
+        "group",
+        {
+            "group": {
+                "group_zero": {"entities": "test.one, test.two"},
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    mock_platform(
+        hass,
+        "test.group",
+        Mock(async_describe_on_off_states=async_describe_on_off_states),
+    )
+    assert await async_setup_component(hass, "test", {})
+    await hass.async_block_till_done()
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+    assert hass.states.get("group.group_zero").state == "heating"
+
+    hass.states.async_set("test.one", "idle")
+    await hass.async_block_till_done()
+    assert hass.states.get("group.group_zero").state == "idle"
+
+
 async def test_device_tracker_not_home(hass: HomeAssistant) -> None:
     """Test group of device_tracker not_home."""
     await async_setup_component(hass, "device_tracker", {})
@@ -1686,6 +2018,126 @@ async def test_group_that_references_two_types_of_groups(hass: HomeAssistant) ->
     assert hass.states.get("group.grouped_group").state == "on"
 
 
+async def test_chained_groups_settle(hass: HomeAssistant) -> None:
+    """Group of a group of a group follows a member change."""
+    hass.states.async_set("light.bowl", STATE_OFF)
+
+    assert await async_setup_component(
+        hass,
+        "group",
+        {
+            "group": {
+                "inner": {"entities": ["light.bowl"]},
+                "outer": {"entities": ["group.inner"]},
+                "outermost": {"entities": ["group.outer"]},
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.outermost").state == STATE_OFF
+
+    hass.states.async_set("light.bowl", STATE_ON)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.inner").state == STATE_ON
+    assert hass.states.get("group.outer").state == STATE_ON
+    assert hass.states.get("group.outermost").state == STATE_ON
+
+
+async def test_chained_light_groups_settle(hass: HomeAssistant) -> None:
+    """Light group of a light group follows a member change."""
+    hass.states.async_set("light.bowl", STATE_OFF)
+    hass.states.async_set("light.ceiling", STATE_OFF)
+
+    assert await async_setup_component(
+        hass,
+        "light",
+        {
+            "light": [
+                {
+                    "platform": group.DOMAIN,
+                    "entities": ["light.bowl", "light.ceiling"],
+                    "name": "Inner Group",
+                },
+                {
+                    "platform": group.DOMAIN,
+                    "entities": ["light.inner_group"],
+                    "name": "Outer Group",
+                },
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("light.outer_group").state == STATE_OFF
+
+    hass.states.async_set("light.bowl", STATE_ON)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("light.inner_group").state == STATE_ON
+    assert hass.states.get("light.outer_group").state == STATE_ON
+
+
+async def test_group_that_references_an_unavailable_group(
+    hass: HomeAssistant,
+) -> None:
+    """Group that references a group which becomes unavailable."""
+    hass.states.async_set("group.lights", STATE_ON)
+
+    assert await async_setup_component(
+        hass,
+        "group",
+        {"group": {"grouped_group": {"entities": ["group.lights"]}}},
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.grouped_group").state == STATE_ON
+
+    hass.states.async_set("group.lights", "unavailable")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.grouped_group").state == STATE_UNKNOWN
+
+    hass.states.async_set("group.lights", STATE_OFF)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.grouped_group").state == STATE_OFF
+
+
+async def test_light_group_with_unavailable_members(hass: HomeAssistant) -> None:
+    """Group of lights whose members become unavailable."""
+    hass.states.async_set("light.bowl", STATE_ON)
+    hass.states.async_set("light.ceiling", STATE_OFF)
+
+    assert await async_setup_component(
+        hass,
+        "group",
+        {"group": {"lights": {"entities": ["light.bowl", "light.ceiling"]}}},
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.lights").state == STATE_ON
+
+    hass.states.async_set("light.bowl", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.lights").state == STATE_OFF
+
+    # Unavailable members no longer imply an on state
+    hass.states.async_set("light.ceiling", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.lights").state == STATE_UNKNOWN
+
+    hass.states.async_set("light.ceiling", STATE_ON)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("group.lights").state == STATE_ON
+
+
 async def test_plant_group(hass: HomeAssistant) -> None:
     """Test plant states can be grouped."""
 
@@ -35,6 +35,7 @@ from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_SUPPORTED_FEATURES,
     EVENT_CALL_SERVICE,
+    EVENT_STATE_CHANGED,
     STATE_OFF,
     STATE_ON,
     STATE_UNAVAILABLE,
@@ -178,6 +179,39 @@ async def test_state_reporting_any(hass: HomeAssistant) -> None:
     assert hass.states.get("light.light_group").state == STATE_UNAVAILABLE
 
 
+async def test_burst_of_member_changes_is_coalesced(hass: HomeAssistant) -> None:
+    """Test a burst of member changes results in a single group update."""
+    hass.states.async_set("light.test1", STATE_OFF)
+    hass.states.async_set("light.test2", STATE_OFF)
+    await async_setup_component(
+        hass,
+        LIGHT_DOMAIN,
+        {
+            LIGHT_DOMAIN: {
+                "platform": DOMAIN,
+                "entities": ["light.test1", "light.test2"],
+                "all": "false",
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    await hass.async_start()
+    await hass.async_block_till_done()
+    assert hass.states.get("light.light_group").state == STATE_OFF
+
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set("light.test1", STATE_ON)
+    hass.states.async_set("light.test2", STATE_ON)
+    hass.states.async_set("light.test1", STATE_OFF)
+    await hass.async_block_till_done()
+
+    group_events = [
+        event for event in events if event.data["entity_id"] == "light.light_group"
+    ]
+    assert len(group_events) == 1
+    assert hass.states.get("light.light_group").state == STATE_ON
+
+
 async def test_state_reporting_all(hass: HomeAssistant) -> None:
     """Test the state reporting in 'all' mode.
 